@@ -419,6 +419,13 @@ class ConceptRecognitionAgent(BaseAgent):
             relevance_factor = self.relevance_factor
         logger.debug(f"System prompt = {prompt}")
         concept_pairs = []
+        # the store cannot filter ids by prefix, so over-fetch when a prefix
+        # filter will drop results post-hoc, and stop once limit survivors
+        # have been kept
+        prefix_tuple = tuple(f"{p}:" for p in self.prefixes) if self.prefixes else None
+        limit = kwargs.pop("limit", None)
+        if limit is not None:
+            kwargs["limit"] = limit * 5 if prefix_tuple else limit
         for obj, _, _obj_meta in self.knowledge_source.search(
             text,
             relevance_factor=relevance_factor,
@@ -426,8 +433,8 @@ class ConceptRecognitionAgent(BaseAgent):
             **kwargs,
         ):
             id, label = obj.get(id_field, None), obj.get(label_field, None)
-            if self.prefixes:
-                if not any(id.startswith(prefix + ":") for prefix in self.prefixes):
+            if prefix_tuple:
+                if not id.startswith(prefix_tuple):
                     continue
             if not id:
                 raise ValueError(f"Object {obj} has no ID field {id_field}")
@@ -435,4 +442,6 @@ class ConceptRecognitionAgent(BaseAgent):
                 raise ValueError(f"Object {obj} has no label field {label_field}")
             prompt += f"{label} // {id}   \n"
             concept_pairs.append((id, label))
+            if limit is not None and len(concept_pairs) >= limit:
+                break
         return concept_pairs, prompt
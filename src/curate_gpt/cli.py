@@ -3,44 +3,83 @@ import csv
 import gzip
 import json
 import logging
+import os
+import re
 import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Union
+from queue import Full, Queue
+from threading import Event, Thread
+from typing import Callable, Dict, Iterator, List, Union
 
 import click
-import pandas as pd
 import yaml
 from click_default_group import DefaultGroup
 from linkml_runtime.dumpers import json_dumper
 from linkml_runtime.utils.yamlutils import YAMLRoot
-from llm import UnknownModelError, get_model, get_plugins
-from llm.cli import load_conversation
-from oaklib import get_adapter
 from pydantic import BaseModel
 
 from curate_gpt import ChromaDBAdapter, __version__
-from curate_gpt.agents.chat_agent import ChatAgent, ChatResponse
 from curate_gpt.agents.concept_recognition_agent import AnnotationMethod, ConceptRecognitionAgent
-from curate_gpt.agents.dase_agent import DatabaseAugmentedStructuredExtraction
-from curate_gpt.agents.dragon_agent import DragonAgent
-from curate_gpt.agents.evidence_agent import EvidenceAgent
-from curate_gpt.agents.summarization_agent import SummarizationAgent
-from curate_gpt.evaluation.dae_evaluator import DatabaseAugmentedCompletionEvaluator
-from curate_gpt.evaluation.evaluation_datamodel import StratifiedCollection, Task
-from curate_gpt.evaluation.runner import run_task
-from curate_gpt.evaluation.splitter import stratify_collection
 from curate_gpt.extract import AnnotatedObject
 from curate_gpt.extract.basic_extractor import BasicExtractor
 from curate_gpt.store.schema_proxy import SchemaProxy
-from curate_gpt.utils.vectordb_operations import match_collections
 from curate_gpt.wrappers import BaseWrapper, get_wrapper
-from curate_gpt.wrappers.literature.pubmed_wrapper import PubmedWrapper
-from curate_gpt.wrappers.ontology import OntologyWrapper
+
+# heavy modules (pandas, oaklib, llm, the agents and evaluation machinery)
+# are imported lazily inside the commands that use them, to keep CLI
+# startup fast for commands that do not need them
 
 __all__ = [
     "main",
 ]
 
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+try:
+    from yaml import CSafeDumper as YamlDumper
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeDumper as YamlDumper
+    from yaml import SafeLoader as YamlLoader
+
+
+def _iter_records(file: str) -> Iterator[Dict]:
+    """
+    Stream records from a file, one object at a time.
+
+    CSV/TSV rows and YAML documents are yielded as they are parsed, so
+    ingestion is pipelined into the store without materializing the whole
+    file in memory.
+
+    :param file:
+    :return:
+    """
+    if file.endswith(".json"):
+        with open(file) as f:
+            objs = json.load(f)
+        if isinstance(objs, dict):
+            objs = [objs]
+        yield from objs
+    elif file.endswith(".csv"):
+        with open(file) as f:
+            yield from csv.DictReader(f)
+    elif file.endswith(".tsv.gz"):
+        with gzip.open(file, "rt") as f:
+            yield from csv.DictReader(f, delimiter="\t")
+    elif file.endswith(".tsv"):
+        with open(file) as f:
+            yield from csv.DictReader(f, delimiter="\t")
+    else:
+        with open(file) as f:
+            for objs in yaml.load_all(f, Loader=YamlLoader):
+                if isinstance(objs, dict):
+                    yield objs
+                else:
+                    yield from objs
+
 
 def dump(obj: Union[str, AnnotatedObject, Dict], format="yaml") -> None:
     """
@@ -53,16 +92,22 @@ def dump(obj: Union[str, AnnotatedObject, Dict], format="yaml") -> None:
     if isinstance(obj, str):
         print(obj)
         return
-    if isinstance(obj, AnnotatedObject):
-        obj = obj.object
-    if isinstance(obj, BaseModel):
-        obj = obj.dict()
-    if isinstance(obj, YAMLRoot):
-        obj = json_dumper.to_dict(obj)
+    if not isinstance(obj, dict):
+        # only non-dicts need coercion; plain dicts are the common hot path
+        if isinstance(obj, AnnotatedObject):
+            obj = obj.object
+        if isinstance(obj, BaseModel):
+            obj = obj.dict()
+        if isinstance(obj, YAMLRoot):
+            obj = json_dumper.to_dict(obj)
     if format is None or format == "yaml":
-        set = yaml.dump(obj, sort_keys=False)
+        set = yaml.dump(obj, Dumper=YamlDumper, sort_keys=False)
     elif format == "json":
         set = json.dumps(obj, indent=2)
+    elif format == "jsonl":
+        # newline-delimited JSON, one compact record per line
+        sys.stdout.write(json.dumps(obj, separators=(",", ":")) + "\n")
+        return
     elif format == "blob":
         set = list(obj.values())[0]
     else:
@@ -81,7 +126,7 @@ collection_option = click.option("-c", "--collection", help="Collection within t
 output_format_option = click.option(
     "-t",
     "--output-format",
-    type=click.Choice(["yaml", "json", "blob", "csv"]),
+    type=click.Choice(["yaml", "json", "jsonl", "blob", "csv"]),
     default="yaml",
     help="Output format for results.",
 )
@@ -122,11 +167,15 @@ init_with_option = click.option(
     help="YAML string for initialization of main wrapper object.",
 )
 batch_size_option = click.option(
-    "--batch-size", default=None, show_default=True, type=click.INT, help="Batch size for indexing."
+    "--batch-size",
+    default=200,
+    show_default=True,
+    type=click.INT,
+    help="Number of records to embed and insert per store commit.",
 )
 
 
-def show_chat_response(response: ChatResponse, show_references: bool = True):
+def show_chat_response(response: "ChatResponse", show_references: bool = True):  # noqa: F821
     """Show a chat response."""
     print("# Response:\n")
     click.echo(response.formatted_body)
@@ -195,6 +244,13 @@ def main(verbose: int, quiet: bool):
 @click.option(
     "--collect/--no-collect", default=False, show_default=True, help="Whether to collect files."
 )
+@click.option(
+    "--jobs",
+    "-j",
+    default=None,
+    type=click.INT,
+    help="Number of worker threads for parsing files in parallel (default: one per CPU, max 8).",
+)
 @batch_size_option
 @click.argument("files", nargs=-1)
 def index(
@@ -210,6 +266,7 @@ def index(
     glob,
     view,
     collect,
+    jobs,
     **kwargs,
 ):
     """
@@ -222,6 +279,9 @@ def index(
     """
     db = ChromaDBAdapter(path, **kwargs)
     db.text_lookup = text_field
+    max_batch_size = getattr(db.client, "max_batch_size", None)
+    if batch_size and max_batch_size:
+        batch_size = min(batch_size, max_batch_size)
     if glob:
         files = [str(gf.absolute()) for f in files for gf in Path().glob(f) if gf.is_file()]
     if view:
@@ -237,27 +297,86 @@ def index(
     if not append:
         if collection in db.list_collection_names():
             db.remove_collection(collection)
+    existing_ids = set()
+    if append and collection in db.list_collection_names():
+        # deduplication is by the id field; skipping client-side avoids
+        # re-embedding records that are already in the collection
+        existing_ids = set(db.client.get_collection(collection).get(include=[])["ids"])
+        logging.info(f"Skipping {len(existing_ids)} already-indexed ids in {collection}")
+
+    def _skip_indexed(objs):
+        for obj in objs:
+            obj_id = obj.get("id") if isinstance(obj, dict) else getattr(obj, "id", None)
+            if obj_id is not None and obj_id in existing_ids:
+                continue
+            yield obj
+
     if model is None:
         model = "openai:"
-    for file in files:
-        logging.debug(f"Indexing {file}")
-        if wrapper:
-            wrapper.source_locator = file
-            objs = wrapper.objects()  # iterator
-        elif file.endswith(".json"):
-            objs = json.load(open(file))
-        elif file.endswith(".csv"):
-            objs = list(csv.DictReader(open(file)))
-        elif file.endswith(".tsv.gz"):
-            with gzip.open(file, "rt") as f:
-                objs = list(csv.DictReader(f, delimiter="\t"))
-        elif file.endswith(".tsv"):
-            objs = list(csv.DictReader(open(file), delimiter="\t"))
-        else:
-            objs = yaml.safe_load(open(file))
-        if isinstance(objs, (dict, BaseModel)):
-            objs = [objs]
-        db.insert(objs, model=model, collection=collection, batch_size=batch_size)
+    if jobs is None:
+        jobs = min(8, os.cpu_count() or 1)
+    if wrapper or jobs <= 1 or len(files) <= 1:
+        for file in files:
+            logging.debug(f"Indexing {file}")
+            if wrapper:
+                wrapper.source_locator = file
+                objs = wrapper.objects()  # iterator
+            else:
+                objs = _iter_records(file)
+            if existing_ids:
+                objs = _skip_indexed(objs)
+            db.insert(objs, model=model, collection=collection, batch_size=batch_size)
+    else:
+        # parse files in worker threads; a single consumer feeds the store so
+        # that ChromaDB only ever sees one writer
+        queue: Queue = Queue(maxsize=2 * jobs)
+        stop = Event()
+
+        def _put(batch):
+            # bounded put that gives up once the consumer has stopped, so a
+            # failed insert cannot leave producers blocked on a full queue
+            while not stop.is_set():
+                try:
+                    queue.put(batch, timeout=0.1)
+                    return
+                except Full:
+                    continue
+
+        def _parse_file(file):
+            logging.debug(f"Indexing {file}")
+            batch = []
+            for obj in _skip_indexed(_iter_records(file)):
+                if stop.is_set():
+                    return
+                batch.append(obj)
+                if len(batch) >= batch_size:
+                    _put(batch)
+                    batch = []
+            if batch:
+                _put(batch)
+
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = [executor.submit(_parse_file, file) for file in files]
+
+            def _signal_done():
+                try:
+                    for future in futures:
+                        future.exception()
+                finally:
+                    _put(None)
+
+            Thread(target=_signal_done, daemon=True).start()
+            try:
+                while True:
+                    batch = queue.get()
+                    if batch is None:
+                        break
+                    db.insert(batch, model=model, collection=collection, batch_size=batch_size)
+            except BaseException:
+                stop.set()
+                raise
+        for future in futures:
+            future.result()
     db.update_collection_metadata(
         collection, model=model, object_type=object_type, description=description
     )
@@ -282,12 +401,14 @@ def search(query, path, collection, show_documents, **kwargs):
     i = 0
     for obj, distance, meta in results:
         i += 1
-        print(f"## {i} DISTANCE: {distance}")
-        print(yaml.dump(obj, sort_keys=False))
+        parts = [
+            f"## {i} DISTANCE: {distance}\n",
+            yaml.dump(obj, Dumper=YamlDumper, sort_keys=False),
+            "\n",
+        ]
         if show_documents:
-            print("```")
-            print(meta)
-            print("```")
+            parts.extend(("```\n", f"{meta}\n", "```\n"))
+        sys.stdout.write("".join(parts))
 
 
 @main.command(name="all-by-all")
@@ -342,40 +463,49 @@ def all_by_all(
     **kwargs,
 ):
     """Match two collections."""
+    from curate_gpt.utils.vectordb_operations import match_collections
+
     db = ChromaDBAdapter(path)
     if other_path is None:
         other_path = path
     other_db = ChromaDBAdapter(other_path)
     results = match_collections(db, collection, other_collection, other_db)
 
-    def _obj(obj: Dict, is_left=False) -> Any:
+    def _side_obj(side: str, fields) -> Callable[[Dict], Dict]:
+        # resolve the ids_only/field-list branching once per side,
+        # outside the per-row loop
         if ids_only:
-            obj = {"id": obj["id"]}
-        if is_left and left_field:
-            return {f"left_{k}": obj[k] for k in left_field}
-        if not is_left and right_field:
-            return {f"right_{k}": obj[k] for k in right_field}
-        side = "left" if is_left else "right"
-        obj = {f"{side}_{k}": v for k, v in obj.items()}
-        return obj
+            return lambda obj: {f"{side}_id": obj["id"]}
+        if fields:
+            return lambda obj: {f"{side}_{k}": obj[k] for k in fields}
+        return lambda obj: {f"{side}_{k}": v for k, v in obj.items()}
+
+    _left_obj = _side_obj("left", left_field)
+    _right_obj = _side_obj("right", right_field)
 
     i = 0
+    writer = None
+    left_fields = right_fields = None
     for obj1, obj2, sim in results:
         if threshold and sim < threshold:
             continue
         i += 1
-        obj1 = _obj(obj1, is_left=True)
-        obj2 = _obj(obj2, is_left=False)
-        row = {**obj1, **obj2, "similarity": sim}
+        obj1 = _left_obj(obj1)
+        obj2 = _right_obj(obj2)
         if output_format == "csv":
-            if i == 1:
-                fieldnames = list(row.keys())
-                dw = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
-                dw.writeheader()
-            dw.writerow({k: v for k, v in row.items() if k in fieldnames})
+            if writer is None:
+                # freeze the column layout from the first match and write
+                # positionally from then on; no per-row dict construction
+                left_fields = tuple(obj1.keys())
+                right_fields = tuple(obj2.keys())
+                writer = csv.writer(sys.stdout)
+                writer.writerow(left_fields + right_fields + ("similarity",))
+            writer.writerow(
+                [obj1.get(k) for k in left_fields] + [obj2.get(k) for k in right_fields] + [sim]
+            )
             continue
 
-        print(f"\n## Match {i} COSINE SIMILARITY: {sim}")
+        sys.stdout.write(f"\n## Match {i} COSINE SIMILARITY: {sim}\n")
         dump(obj1, output_format)
         dump(obj2, output_format)
 
@@ -394,8 +524,11 @@ def matches(id, path, collection):
     results = db.matches(obj, collection=collection)
     i = 0
     for obj, distance in results:
-        print(f"## {i} DISTANCE: {distance}")
-        print(yaml.dump(obj, sort_keys=False))
+        sys.stdout.write(
+            f"## {i} DISTANCE: {distance}\n"
+            + yaml.dump(obj, Dumper=YamlDumper, sort_keys=False)
+            + "\n"
+        )
 
 
 @main.command()
@@ -433,7 +566,7 @@ def matches(id, path, collection):
     "-M",
     default=AnnotationMethod.INLINE.value,
     show_default=True,
-    type=click.Choice([m for m in AnnotationMethod]),
+    type=click.Choice([m.value for m in AnnotationMethod]),
     help="Annotation method.",
 )
 @click.option(
@@ -477,11 +610,7 @@ def annotate(
     if label_field:
         cr.label_field = label_field
     if split_sentences:
-        new_texts = []
-        for text in texts:
-            for sentence in text.split("."):
-                new_texts.append(sentence.strip())
-        texts = new_texts
+        texts = (s.strip() for text in texts for s in _SENTENCE_RE.split(text) if s.strip())
     for text in texts:
         ao = cr.annotate(text, collection=collection, categories=categories, **kwargs)
         dump(ao)
@@ -539,6 +668,8 @@ def extract(
     **kwargs,
 ):
     """Extract."""
+    from curate_gpt.agents.dase_agent import DatabaseAugmentedStructuredExtraction
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -560,7 +691,8 @@ def extract(
     if not text:
         if not input:
             raise ValueError("Must provide either text or input file.")
-        text = list(open(input).readlines())
+        with open(input) as f:
+            text = list(f)
     text = "\n".join(text)
     ao = agent.extract(text, rules=rule, **filtered_kwargs)
     dump(ao.object, format=output_format)
@@ -603,10 +735,18 @@ def extract(
 @click.option(
     "--pubmed-id-file",
 )
+@click.option(
+    "--concurrency",
+    default=4,
+    show_default=True,
+    type=click.INT,
+    help="Number of concurrent full-text fetches (respect NCBI rate limits).",
+)
 @click.argument("ids", nargs=-1)
 def extract_from_pubmed(
     ids,
     pubmed_id_file,
+    concurrency,
     output_directory,
     path,
     docstore_path,
@@ -618,6 +758,9 @@ def extract_from_pubmed(
     **kwargs,
 ):
     """Extract."""
+    from curate_gpt.agents.dase_agent import DatabaseAugmentedStructuredExtraction
+    from curate_gpt.wrappers.literature.pubmed_wrapper import PubmedWrapper
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -639,18 +782,72 @@ def extract_from_pubmed(
     if not ids:
         if not pubmed_id_file:
             raise ValueError("Must provide either text or input file.")
-        ids = [x.strip() for x in open(pubmed_id_file).readlines()]
+        with open(pubmed_id_file) as f:
+            ids = [x.strip() for x in f]
     pmw = PubmedWrapper()
     output_directory = Path(output_directory)
     output_directory.mkdir(exist_ok=True, parents=True)
-    for pmid in ids:
-        pmid_esc = pmid.replace(":", "_")
-        text = pmw.fetch_full_text(pmid)
-        ao = agent.extract(text, rules=rule, **filtered_kwargs)
-        with open(output_directory / f"{pmid_esc}.yaml", "w") as f:
-            f.write(yaml.dump(ao.object, sort_keys=False))
-        with open(output_directory / f"{pmid_esc}.txt", "w") as f:
-            f.write(text)
+    # full-text fetches are network-bound; prefetch them concurrently while
+    # the (serial) LLM extraction works through the results in input order.
+    # disk writes land on a dedicated writer thread so the main thread can
+    # issue the next extraction while the previous result is persisted
+    write_queue: Queue = Queue(maxsize=32)
+    writer_errors: List[BaseException] = []
+    writer_stopped = Event()
+
+    def _write_results():
+        try:
+            while True:
+                item = write_queue.get()
+                if item is None:
+                    break
+                pmid_esc, text, obj = item
+                with open(output_directory / f"{pmid_esc}.yaml", "w") as f:
+                    f.write(yaml.dump(obj, Dumper=YamlDumper, sort_keys=False))
+                with open(output_directory / f"{pmid_esc}.txt", "w") as f:
+                    f.write(text)
+        except BaseException as e:
+            writer_errors.append(e)
+            writer_stopped.set()
+
+    def _enqueue(item):
+        # bounded put that gives up once the writer has died, so a failed
+        # write cannot leave the main thread blocked on a full queue
+        while not writer_stopped.is_set():
+            try:
+                write_queue.put(item, timeout=0.1)
+                return
+            except Full:
+                continue
+
+    writer = Thread(target=_write_results)
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            # keep a bounded window of fetches in flight: executor.map would
+            # submit every id up front and buffer all full texts while the
+            # (slower) serial extraction lags behind
+            id_iter = iter(ids)
+            in_flight: deque = deque()
+            for pmid in islice(id_iter, concurrency * 2):
+                in_flight.append((pmid, executor.submit(pmw.fetch_full_text, pmid)))
+            while in_flight:
+                if writer_errors:
+                    # stop burning extraction calls once output is failing
+                    break
+                pmid, future = in_flight.popleft()
+                text = future.result()
+                next_pmid = next(id_iter, None)
+                if next_pmid is not None:
+                    in_flight.append((next_pmid, executor.submit(pmw.fetch_full_text, next_pmid)))
+                pmid_esc = pmid.replace(":", "_")
+                ao = agent.extract(text, rules=rule, **filtered_kwargs)
+                _enqueue((pmid_esc, text, ao.object))
+    finally:
+        _enqueue(None)
+        writer.join()
+    if writer_errors:
+        raise writer_errors[0]
 
 
 @main.command()
@@ -709,6 +906,8 @@ def complete(
 
     If the string looks like yaml (if it has a ':') then it will be parsed as yaml.
     """
+    from curate_gpt.agents.dragon_agent import DragonAgent
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -728,7 +927,7 @@ def complete(
         dac.document_adapter = ChromaDBAdapter(docstore_path)
         dac.document_adapter_collection = docstore_collection
     if ":" in query:
-        query = yaml.safe_load(query)
+        query = yaml.load(query, Loader=YamlLoader)
     ao = dac.complete(query, context_property=query_property, rules=rule, **filtered_kwargs)
     dump(ao.object, format=output_format)
 
@@ -787,6 +986,8 @@ def complete_multiple(
     -------
         curategpt generate  -c obo_go terms.txt
     """
+    from curate_gpt.agents.dragon_agent import DragonAgent
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -809,9 +1010,9 @@ def complete_multiple(
         queries = [l.strip() for l in f.readlines()]
         for query in queries:
             if ":" in query:
-                query = yaml.safe_load(query)
+                query = yaml.load(query, Loader=YamlLoader)
             ao = dac.complete(query, context_property=query_property, rules=rule, **filtered_kwargs)
-            print("---")
+            sys.stdout.write("---\n")
             dump(ao.object, format=output_format)
 
 
@@ -878,6 +1079,8 @@ def complete_all(
     -------
         curategpt generate  -c obo_go TODO
     """
+    from curate_gpt.agents.dragon_agent import DragonAgent
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -906,8 +1109,14 @@ def complete_all(
         object_ids=object_ids,
         **filtered_kwargs,
     )
-    for pred in it:
-        print(yaml.dump(pred.dict(), sort_keys=False))
+    # one emitter for the whole stream; predictions are emitted as they arrive
+    yaml.dump_all(
+        (pred.dict() for pred in it),
+        sys.stdout,
+        Dumper=YamlDumper,
+        sort_keys=False,
+        explicit_start=True,
+    )
 
 
 @main.command()
@@ -977,6 +1186,9 @@ def generate_evaluate(
     -------
         curategpt -v generate-evaluate -c cdr_training -T cdr_test -F statements -m gpt-4
     """
+    from curate_gpt.agents.dragon_agent import DragonAgent
+    from curate_gpt.evaluation.dae_evaluator import DatabaseAugmentedCompletionEvaluator
+
     db = ChromaDBAdapter(path)
     if schema:
         schema_manager = SchemaProxy(schema)
@@ -1074,16 +1286,27 @@ def evaluate(
     -------
         curategpt evaluate src/curate_gpt/conf/tasks/bio-ont.tasks.yaml
     """
+    from curate_gpt.evaluation.evaluation_datamodel import Task
+    from curate_gpt.evaluation.runner import run_task
+
     normalized_tasks = []
     for task in tasks:
         if ":" in task:
-            task = yaml.safe_load(task)
-        else:
-            task = yaml.safe_load(open(task))
-        if isinstance(task, list):
-            normalized_tasks.extend(task)
+            docs = [yaml.load(task, Loader=YamlLoader)]
         else:
-            normalized_tasks.append(task)
+            # task files may be a single list document or a stream of
+            # documents (as written by evaluation-config); hand the loader
+            # the whole file in one read rather than a stream
+            docs = list(yaml.load_all(Path(task).read_bytes(), Loader=YamlLoader))
+        for doc in docs:
+            if isinstance(doc, list):
+                normalized_tasks.extend(doc)
+            else:
+                normalized_tasks.append(doc)
+    # parse the comma-separated field options once, not per task
+    hold_back_field_list = hold_back_fields.split(",") if hold_back_fields else None
+    mask_field_list = mask_fields.split(",") if mask_fields else None
+    results = []
     for task in normalized_tasks:
         task_obj = Task(**task)
         if path:
@@ -1094,10 +1317,10 @@ def evaluate(
             task_obj.source_collection = collection
         if model:
             task_obj.model_name = model
-        if hold_back_fields:
-            task_obj.hold_back_fields = hold_back_fields.split(",")
-        if mask_fields:
-            task_obj.mask_fields = mask_fields.split(",")
+        if hold_back_field_list:
+            task_obj.hold_back_fields = hold_back_field_list
+        if mask_field_list:
+            task_obj.mask_fields = mask_field_list
         if num_testing is not None:
             task_obj.num_testing = int(num_testing)
         if generate_background:
@@ -1105,8 +1328,9 @@ def evaluate(
         if rule:
             # TODO
             task_obj.rules = rule
-        result = run_task(task_obj, **kwargs)
-        print(yaml.dump(result.dict(), sort_keys=False))
+        results.append(run_task(task_obj, **kwargs).dict())
+    # one emitter for all task results; per-task dumps dominate for long runs
+    yaml.dump_all(results, sys.stdout, Dumper=YamlDumper, sort_keys=False, explicit_start=True)
 
 
 @main.command()
@@ -1117,27 +1341,34 @@ def evaluate(
 @click.option("--num-testing", default=50, show_default=True)
 @click.option("--background", default="false", show_default=True)
 def evaluation_config(collections, models, fields_to_mask, fields_to_predict, background, **kwargs):
-    tasks = []
-    for collection in collections.split(","):
-        for model in models.split(","):
-            for fp in fields_to_predict.split(","):
-                for bg in background.split(","):
-                    tc = Task(
-                        source_db_path="db",
-                        target_db_path="db",
-                        model_name=model,
-                        source_collection=collection,
-                        fields_to_predict=[fp],
-                        fields_to_mask=fields_to_mask.split(","),
-                        generate_background=json.loads(bg),
-                        stratified_collection=StratifiedCollection(
-                            training_set_collection=f"{collection}_training",
-                            testing_set_collection=f"{collection}_testing",
-                        ),
-                        **kwargs,
-                    )
-                    tasks.append(tc.dict(exclude_unset=True))
-    print(yaml.dump(tasks, sort_keys=False))
+    from curate_gpt.evaluation.evaluation_datamodel import StratifiedCollection, Task
+
+    mask_field_list = fields_to_mask.split(",")
+
+    def _tasks() -> Iterator[Dict]:
+        for collection in collections.split(","):
+            for model in models.split(","):
+                for fp in fields_to_predict.split(","):
+                    for bg in background.split(","):
+                        tc = Task(
+                            source_db_path="db",
+                            target_db_path="db",
+                            model_name=model,
+                            source_collection=collection,
+                            fields_to_predict=[fp],
+                            fields_to_mask=mask_field_list,
+                            generate_background=json.loads(bg),
+                            stratified_collection=StratifiedCollection(
+                                training_set_collection=f"{collection}_training",
+                                testing_set_collection=f"{collection}_testing",
+                            ),
+                            **kwargs,
+                        )
+                        yield tc.dict(exclude_unset=True)
+
+    # stream the cartesian product as YAML documents instead of holding
+    # every task dict in a list; evaluate accepts multi-document task files
+    yaml.dump_all(_tasks(), sys.stdout, Dumper=YamlDumper, sort_keys=False, explicit_start=True)
 
 
 @main.command()
@@ -1150,34 +1381,47 @@ def evaluation_config(collections, models, fields_to_mask, fields_to_predict, ba
 @click.argument("files", nargs=-1)
 def evaluation_compare(files, include_expected=False):
     """Compare evaluation results."""
+    import pandas as pd
+
     dfs = []
     predicted_cols = []
     other_cols = []
+    seen_cols = set()
     differentia_col = "method"
     for f in files:
         df = pd.read_csv(f, sep="\t", comment="#")
         df[differentia_col] = f
         if include_expected:
             include_expected = False
-            base_df = df.copy()
+            # shallow copy: column assignment below rebinds blocks on the
+            # copy without touching df
+            base_df = df.copy(deep=False)
             base_df[differentia_col] = "source"
-            for c in base_df.columns:
-                if c.startswith("expected_"):
-                    new_col = c.replace("expected_", "predicted_")
-                    base_df[new_col] = base_df[c]
+            base_df = base_df.assign(
+                **{
+                    c.replace("expected_", "predicted_"): df[c]
+                    for c in df.columns
+                    if c.startswith("expected_")
+                }
+            )
             dfs.append(base_df)
         dfs.append(df)
         for c in df.columns:
-            if c in predicted_cols or c in other_cols:
+            if c in seen_cols:
                 continue
+            seen_cols.add(c)
             if c.startswith("predicted_"):
                 predicted_cols.append(c)
             else:
                 other_cols.append(c)
-    df = pd.concat(dfs)
+    df = pd.concat(dfs, copy=False, ignore_index=True)
     # df = pd.melt(df, id_vars=["masked_id", "file"], value_vars=["predicted_definition"])
-    df = pd.melt(df, id_vars=list(other_cols), value_vars=list(predicted_cols))
-    df = df.sort_values(by=list(other_cols))
+    df = pd.melt(df, id_vars=list(other_cols), value_vars=list(predicted_cols), ignore_index=True)
+    # categorical keys sort on integer codes, much cheaper than strings
+    object_keys = [c for c in other_cols if df[c].dtype == object]
+    if object_keys:
+        df[object_keys] = df[object_keys].astype("category")
+    df = df.sort_values(by=list(other_cols), kind="stable", na_position="last")
     df.to_csv(sys.stdout, sep="\t", index=False)
 
 
@@ -1195,14 +1439,25 @@ def evaluation_compare(files, include_expected=False):
 @model_option
 @click.argument("file")
 def multiprompt(file, model, system, prompt):
+    from llm import get_model
+
     if model is None:
         model = "gpt-3.5-turbo"
     model_obj = get_model(model)
     with open(file) as f:
-        for row in csv.DictReader(f, delimiter="\t"):
-            resp = model_obj.prompt(system=system, prompt=prompt.format(**row)).text()
-            resp = resp.replace("\n", " ")
-            print("\t".join(list(row.values()) + [resp]))
+        rows = list(csv.DictReader(f, delimiter="\t"))
+    # format_map interpolates straight from each row dict, skipping the
+    # per-row kwargs copy that format(**row) makes
+    prompts = [prompt.format_map(row) for row in rows]
+
+    def _prompt(p: str) -> str:
+        return model_obj.prompt(system=system, prompt=p).text()
+
+    writer = csv.writer(sys.stdout, delimiter="\t", lineterminator="\n")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        # executor.map keeps input order while the calls run concurrently
+        for row, resp in zip(rows, executor.map(_prompt, prompts), strict=True):
+            writer.writerow(list(row.values()) + [resp.replace("\n", " ")])
 
 
 @main.command()
@@ -1232,6 +1487,11 @@ def multiprompt(file, model, system, prompt):
 @click.argument("query")
 def ask(query, path, collection, model, show_references, _continue, conversation_id):
     """Chat with a chatbot."""
+    from llm import UnknownModelError
+    from llm.cli import load_conversation
+
+    from curate_gpt.agents.chat_agent import ChatAgent
+
     db = ChromaDBAdapter(path)
     extractor = BasicExtractor()
     if model:
@@ -1278,6 +1538,9 @@ def ask(query, path, collection, model, show_references, _continue, conversation
 @click.argument("query")
 def citeseek(query, path, collection, model, show_references, _continue, conversation_id):
     """Find citations for an object."""
+    from curate_gpt.agents.chat_agent import ChatAgent
+    from curate_gpt.agents.evidence_agent import EvidenceAgent
+
     db = ChromaDBAdapter(path)
     extractor = BasicExtractor()
     if model:
@@ -1320,6 +1583,8 @@ def summarize(ids, path, collection, model, view, **kwargs):
         HGNC:1160  HGNC:26270 HGNC:24682 HGNC:7225 HGNC:13797 \
         HGNC:9118  HGNC:6396  HGNC:9179 HGNC:25358
     """
+    from curate_gpt.agents.summarization_agent import SummarizationAgent
+
     db = ChromaDBAdapter(path)
     extractor = BasicExtractor()
     if model:
@@ -1335,6 +1600,8 @@ def summarize(ids, path, collection, model, view, **kwargs):
 @main.command()
 def plugins():
     "List installed plugins"
+    from llm import get_plugins
+
     print(yaml.dump(get_plugins()))
 
 
@@ -1366,17 +1633,19 @@ def collections():
 def list_collections(path, peek: bool, minimal: bool, derived: bool):
     """List all collections."""
     db = ChromaDBAdapter(path)
+    lines = []
     for cn in db.collections():
         if minimal:
-            print(f"## Collection: {cn}")
+            lines.append(f"## Collection: {cn}")
             continue
         cm = db.collection_metadata(cn, include_derived=derived)
         c = db.client.get_or_create_collection(cn)
-        print(f"## Collection: {cn} N={c.count()} meta={c.metadata} // {cm}")
+        lines.append(f"## Collection: {cn} N={c.count()} meta={c.metadata} // {cm}")
         if peek:
             r = c.peek()
-            for id in r["ids"]:
-                print(f" - {id}")
+            lines.extend(f" - {id}" for id in r["ids"])
+    # single write; avoids one locked stdout write per collection/id
+    sys.stdout.write("\n".join(lines) + "\n" if lines else "")
 
 
 @collections.command(name="delete")
@@ -1396,8 +1665,13 @@ def peek_collection(path, collection, **kwargs):
     """Inspect a collection."""
     logging.info(f"Peeking at {collection} in {path}")
     db = ChromaDBAdapter(path)
-    for obj in db.peek(collection, **kwargs):
-        print(yaml.dump(obj, sort_keys=False))
+    yaml.dump_all(
+        db.peek(collection, **kwargs),
+        sys.stdout,
+        Dumper=YamlDumper,
+        sort_keys=False,
+        explicit_start=True,
+    )
 
 
 @collections.command(name="dump")
@@ -1475,9 +1749,17 @@ def copy_collection(path, collection, target_path, **kwargs):
     required=True,
     help="Path to write the new store.",
 )
+@batch_size_option
 @path_option
 def split_collection(
-    path, collection, derived_collection_base, output_path, model, test_id_file, **kwargs
+    path,
+    collection,
+    derived_collection_base,
+    output_path,
+    model,
+    test_id_file,
+    batch_size,
+    **kwargs,
 ):
     """
     Split a collection into test/train/validation.
@@ -1490,6 +1772,8 @@ def split_collection(
 
     This can be run as a pre-processing step for generate-evaluate.
     """
+    from curate_gpt.evaluation.splitter import stratify_collection
+
     db = ChromaDBAdapter(path)
     if test_id_file:
         kwargs["testing_identifiers"] = [line.strip().split()[0] for line in test_id_file]
@@ -1501,12 +1785,18 @@ def split_collection(
     output_db = ChromaDBAdapter(output_path)
     if not derived_collection_base:
         derived_collection_base = collection
-    for sn in ["training", "testing", "validation"]:
+
+    def _insert_split(sn: str):
         cn = f"{derived_collection_base}_{sn}"
         output_db.remove_collection(cn, exists_ok=True)
         objs = getattr(sc, f"{sn}_set", [])
         logging.info(f"Writing {len(objs)} objects to {cn}")
-        output_db.insert(objs, collection=cn, model=model)
+        output_db.insert(objs, collection=cn, model=model, batch_size=batch_size)
+
+    # the three splits are independent; overlap their embedding work
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        for _ in executor.map(_insert_split, ["training", "testing", "validation"]):
+            pass
 
 
 @collections.command(name="set")
@@ -1516,7 +1806,7 @@ def split_collection(
 def set_collection_metadata(path, collection, metadata_yaml):
     """Set metadata for a collection."""
     db = ChromaDBAdapter(path)
-    db.update_collection_metadata(collection, **yaml.safe_load(metadata_yaml))
+    db.update_collection_metadata(collection, **yaml.load(metadata_yaml, Loader=YamlLoader))
 
 
 @main.group()
@@ -1538,8 +1828,11 @@ def ontology():
     "--index-fields",
     help="Fields to index; comma sepatrated",
 )
+@batch_size_option
 @click.argument("ont")
-def index_ontology_command(ont, path, collection, append, model, index_fields, branches, **kwargs):
+def index_ontology_command(
+    ont, path, collection, append, model, index_fields, branches, batch_size, **kwargs
+):
     """
     Index an ontology.
 
@@ -1548,6 +1841,10 @@ def index_ontology_command(ont, path, collection, append, model, index_fields, b
         curategpt index-ontology  -c obo_hp $db/hp.db
 
     """
+    from oaklib import get_adapter
+
+    from curate_gpt.wrappers.ontology import OntologyWrapper
+
     oak_adapter = get_adapter(ont)
     view = OntologyWrapper(oak_adapter=oak_adapter)
     if branches:
@@ -1559,13 +1856,12 @@ def index_ontology_command(ont, path, collection, append, model, index_fields, b
 
         # print(f"Indexing fields: {fields}")
         def _text_lookup(obj: Dict):
-            vals = [str(obj.get(f)) for f in fields if f in obj]
-            return " ".join(vals)
+            return " ".join(str(obj[f]) for f in fields if f in obj)
 
         db.text_lookup = _text_lookup
     if not append:
         db.remove_collection(collection, exists_ok=True)
-    db.insert(view.objects(), collection=collection, model=model)
+    db.insert(view.objects(), collection=collection, model=model, batch_size=batch_size)
     db.update_collection_metadata(collection, object_type="OntologyClass")
 
 
@@ -1588,11 +1884,13 @@ def view_objects(view, init_with, **kwargs):
 
     """
     if init_with:
-        for k, v in yaml.safe_load(init_with).items():
+        for k, v in yaml.load(init_with, Loader=YamlLoader).items():
             kwargs[k] = v
     vstore = get_wrapper(view, **kwargs)
-    for obj in vstore.objects():
-        print(yaml.dump(obj, sort_keys=False))
+    # one emitter over the whole stream; avoids a dump + print syscall per object
+    yaml.dump_all(
+        vstore.objects(), sys.stdout, Dumper=YamlDumper, sort_keys=False, explicit_start=True
+    )
 
 
 @view.command(name="unwrap")
@@ -1617,7 +1915,7 @@ def unwrap_objects(input_file, view, path, collection, output_format, **kwargs):
     store = ChromaDBAdapter(path)
     store.set_collection(collection)
     with open(input_file) as f:
-        objs = yaml.safe_load_all(f)
+        objs = yaml.load_all(f, Loader=YamlLoader)
         unwrapped = vstore.unwrap_objects(objs, store=store)
         dump(unwrapped, output_format)
 
@@ -1632,12 +1930,12 @@ def unwrap_objects(input_file, view, path, collection, output_format, **kwargs):
 def view_search(query, view, model, init_with, limit, **kwargs):
     """Search in a virtual store."""
     if init_with:
-        for k, v in yaml.safe_load(init_with).items():
+        for k, v in yaml.load(init_with, Loader=YamlLoader).items():
             kwargs[k] = v
     vstore: BaseWrapper = get_wrapper(view, **kwargs)
     vstore.extractor = BasicExtractor(model_name=model)
     for obj, _dist, _ in vstore.search(query, limit=limit):
-        print(yaml.dump(obj, sort_keys=False))
+        print(yaml.dump(obj, Dumper=YamlDumper, sort_keys=False))
 
 
 @view.command(name="index")
@@ -1652,7 +1950,7 @@ def view_search(query, view, model, init_with, limit, **kwargs):
 def view_index(view, path, append, collection, model, init_with, batch_size, **kwargs):
     """Populate an index from a view."""
     if init_with:
-        for k, v in yaml.safe_load(init_with).items():
+        for k, v in yaml.load(init_with, Loader=YamlLoader).items():
             kwargs[k] = v
     wrapper: BaseWrapper = get_wrapper(view, **kwargs)
     store = ChromaDBAdapter(path)
@@ -1671,6 +1969,8 @@ def view_index(view, path, append, collection, model, init_with, batch_size, **k
 @click.argument("query")
 def view_ask(query, view, model, limit, **kwargs):
     """Ask a knowledge source wrapper."""
+    from curate_gpt.agents.chat_agent import ChatAgent
+
     vstore: BaseWrapper = get_wrapper(view)
     vstore.extractor = BasicExtractor(model_name=model)
     chatbot = ChatAgent(knowledge_source=vstore)
@@ -1695,6 +1995,8 @@ def pubmed():
 )
 @click.argument("query")
 def pubmed_search(query, path, model, **kwargs):
+    from curate_gpt.wrappers.literature.pubmed_wrapper import PubmedWrapper
+
     pubmed = PubmedWrapper()
     db = ChromaDBAdapter(path)
     extractor = BasicExtractor()
@@ -1707,7 +2009,7 @@ def pubmed_search(query, path, model, **kwargs):
     for obj, distance, _ in results:
         i += 1
         print(f"## {i} DISTANCE: {distance}")
-        print(yaml.dump(obj, sort_keys=False))
+        print(yaml.dump(obj, Dumper=YamlDumper, sort_keys=False))
 
 
 @pubmed.command(name="ask")
@@ -1729,6 +2031,8 @@ def pubmed_search(query, path, model, **kwargs):
 )
 @click.argument("query")
 def pubmed_ask(query, path, model, show_references, **kwargs):
+    from curate_gpt.wrappers.literature.pubmed_wrapper import PubmedWrapper
+
     pubmed = PubmedWrapper()
     db = ChromaDBAdapter(path)
     extractor = BasicExtractor()
@@ -1,6 +1,7 @@
+import json
 from typing import Any, Iterator, List, Tuple, Union
 
-import yaml
+import numpy as np
 
 from curate_gpt.evaluation.evaluation_datamodel import (
     AggregationMethod,
@@ -8,6 +9,13 @@ from curate_gpt.evaluation.evaluation_datamodel import (
     ClassificationOutcome,
 )
 
+_OUTCOME_CODES = {
+    ClassificationOutcome.TRUE_POSITIVE: 0,
+    ClassificationOutcome.TRUE_NEGATIVE: 1,
+    ClassificationOutcome.FALSE_POSITIVE: 2,
+    ClassificationOutcome.FALSE_NEGATIVE: 3,
+}
+
 
 def calculate_metrics(
     outcomes: List[Union[ClassificationOutcome, Tuple[ClassificationOutcome, Any]]]
@@ -16,10 +24,19 @@ def calculate_metrics(
         outcome if isinstance(outcome, ClassificationOutcome) else outcome[0]
         for outcome in outcomes
     ]
-    tp = outcomes.count(ClassificationOutcome.TRUE_POSITIVE)
-    tn = outcomes.count(ClassificationOutcome.TRUE_NEGATIVE)
-    fp = outcomes.count(ClassificationOutcome.FALSE_POSITIVE)
-    fn = outcomes.count(ClassificationOutcome.FALSE_NEGATIVE)
+    if len(outcomes) < 1000:
+        tp = outcomes.count(ClassificationOutcome.TRUE_POSITIVE)
+        tn = outcomes.count(ClassificationOutcome.TRUE_NEGATIVE)
+        fp = outcomes.count(ClassificationOutcome.FALSE_POSITIVE)
+        fn = outcomes.count(ClassificationOutcome.FALSE_NEGATIVE)
+    else:
+        # one pass over integer codes instead of four list.count scans
+        codes = np.fromiter(
+            (_OUTCOME_CODES[outcome] for outcome in outcomes),
+            dtype=np.int8,
+            count=len(outcomes),
+        )
+        tp, tn, fp, fn = (int(n) for n in np.bincount(codes, minlength=4))
 
     # Avoid division by zero
     precision = tp / (tp + fp) if tp + fp > 0 else 0
@@ -44,10 +61,10 @@ def calculate_metrics(
 def _normalize(obj: Any) -> str:
     if isinstance(obj, str):
         return obj
-    elif isinstance(obj, dict):
-        return yaml.safe_dump(obj, sort_keys=True)
-    elif isinstance(obj, list):
-        return yaml.safe_dump(obj, sort_keys=True)
+    elif isinstance(obj, (dict, list)):
+        # canonical form only needs to be stable for set membership;
+        # the C json encoder is much faster than the yaml emitter
+        return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
     else:
         return str(obj)
 
@@ -70,13 +87,14 @@ def evaluate_predictions(obj1: Any, obj2: Any) -> Iterator[Tuple[ClassificationO
     if isinstance(obj1, list) and isinstance(obj2, list):
         set1 = {_normalize(obj) for obj in obj1}
         set2 = {_normalize(obj) for obj in obj2}
-        for x in set1.union(set2):
-            if x not in set1:
-                yield ClassificationOutcome.FALSE_NEGATIVE, f"{x} in {set2}"
-            elif x not in set2:
-                yield ClassificationOutcome.FALSE_POSITIVE, f"{x} in {set1}"
-            else:
-                yield ClassificationOutcome.TRUE_POSITIVE, f"{x} in both"
+        # set algebra instead of a union materialization plus two hash
+        # lookups per element
+        for x in set2 - set1:
+            yield ClassificationOutcome.FALSE_NEGATIVE, f"{x} in {set2}"
+        for x in set1 - set2:
+            yield ClassificationOutcome.FALSE_POSITIVE, f"{x} in {set1}"
+        for x in set1 & set2:
+            yield ClassificationOutcome.TRUE_POSITIVE, f"{x} in both"
     else:
         yield from evaluate_predictions([obj1] if obj1 else [], [obj2] if obj2 else [])
 
@@ -94,13 +112,19 @@ def aggregate_metrics(
     :param method:
     :return:
     """
+    # one (N, 5) array; each aggregator reduces it in a single vectorized pass
+    arr = np.array(
+        [[m.precision, m.recall, m.f1_score, m.accuracy, m.specificity] for m in metrics_list],
+        dtype=float,
+    )
     if method == AggregationMethod.MACRO:
+        precision, recall, f1_score, accuracy, specificity = arr.mean(axis=0)
         return ClassificationMetrics(
-            precision=sum(m.precision for m in metrics_list) / len(metrics_list),
-            recall=sum(m.recall for m in metrics_list) / len(metrics_list),
-            f1_score=sum(m.f1_score for m in metrics_list) / len(metrics_list),
-            accuracy=sum(m.accuracy for m in metrics_list) / len(metrics_list),
-            specificity=sum(m.specificity for m in metrics_list) / len(metrics_list),
+            precision=precision,
+            recall=recall,
+            f1_score=f1_score,
+            accuracy=accuracy,
+            specificity=specificity,
             true_positives=sum(
                 m.true_positives for m in metrics_list if m.true_positives is not None
             ),
@@ -137,35 +161,16 @@ def aggregate_metrics(
             specificity=specificity,
         )
     elif method == AggregationMethod.WEIGHTED:
-        total_weight = sum(
-            m.precision + m.recall + m.f1_score + m.accuracy + m.specificity for m in metrics_list
-        )
+        weights = arr.sum(axis=1)
+        precision, recall, f1_score, accuracy, specificity = (arr * weights[:, None]).sum(
+            axis=0
+        ) / weights.sum()
         return ClassificationMetrics(
-            precision=sum(
-                m.precision * (m.precision + m.recall + m.f1_score + m.accuracy + m.specificity)
-                for m in metrics_list
-            )
-            / total_weight,
-            recall=sum(
-                m.recall * (m.precision + m.recall + m.f1_score + m.accuracy + m.specificity)
-                for m in metrics_list
-            )
-            / total_weight,
-            f1_score=sum(
-                m.f1_score * (m.precision + m.recall + m.f1_score + m.accuracy + m.specificity)
-                for m in metrics_list
-            )
-            / total_weight,
-            accuracy=sum(
-                m.accuracy * (m.precision + m.recall + m.f1_score + m.accuracy + m.specificity)
-                for m in metrics_list
-            )
-            / total_weight,
-            specificity=sum(
-                m.specificity * (m.precision + m.recall + m.f1_score + m.accuracy + m.specificity)
-                for m in metrics_list
-            )
-            / total_weight,
+            precision=precision,
+            recall=recall,
+            f1_score=f1_score,
+            accuracy=accuracy,
+            specificity=specificity,
         )
     else:
         raise ValueError("Invalid aggregation method")
@@ -4,6 +4,7 @@ import logging
 import os
 import time
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Callable, ClassVar, Iterable, Iterator, List, Mapping, Optional, Union
 
 import chromadb
@@ -31,6 +32,18 @@ from curate_gpt.utils.vector_algorithms import mmr_diversified_search
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=8)
+def _persistent_client(path: str) -> API:
+    """Create (or reuse) the persistent client for a path.
+
+    Client construction opens sqlite and runs migrations; memoizing it lets
+    repeated adapter instantiations on the same path share one client.
+    """
+    return chromadb.PersistentClient(
+        path=path, settings=Settings(allow_reset=True, anonymized_telemetry=False)
+    )
+
+
 @dataclass
 class ChromaDBAdapter(DBAdapter):
 
@@ -51,9 +64,7 @@ class ChromaDBAdapter(DBAdapter):
         if not self.path:
             self.path = "./db"
         logger.info(f"Using ChromaDB at {self.path}")
-        self.client = chromadb.PersistentClient(
-            path=str(self.path), settings=Settings(allow_reset=True, anonymized_telemetry=False)
-        )
+        self.client = _persistent_client(str(self.path))
 
     def _get_collection_object(self, collection: str = None):
         return self.client.get_collection(name=self._get_collection(collection))
@@ -308,8 +319,10 @@ class ChromaDBAdapter(DBAdapter):
         collection_name = self._get_collection(collection_name)
         metadata = self.collection_metadata(collection_name=collection_name)
         if metadata is None:
+            prev_metadata_dict = None
             metadata = CollectionMetadata(**kwargs)
         else:
+            prev_metadata_dict = metadata.dict(exclude_none=True)
             prev_model = metadata.model
             metadata = metadata.copy(update=kwargs)
             if prev_model and metadata.model != prev_model:
@@ -324,9 +337,11 @@ class ChromaDBAdapter(DBAdapter):
             assert metadata.name == collection_name
         else:
             metadata.name = collection_name
-        self.client.get_or_create_collection(
-            name=collection_name, metadata=metadata.dict(exclude_none=True)
-        )
+        metadata_dict = metadata.dict(exclude_none=True)
+        if metadata_dict != prev_metadata_dict:
+            # avoid rewriting (and re-persisting) unchanged collection metadata;
+            # insert calls this once per batch
+            self.client.get_or_create_collection(name=collection_name, metadata=metadata_dict)
         return metadata
 
     def search(self, text: str, **kwargs) -> Iterator[SEARCH_RESULT]:
@@ -402,6 +402,8 @@ class DBAdapter(ABC):
         if not isinstance(include, list):
             include = list(include)
         objects = self.find(collection=collection, include=include, **kwargs)
+        if metadata is not None:
+            metadata = metadata.dict(exclude_none=True)
         streaming = True
         if format == "jsonl":
             writer = jsonlines.Writer(to_file)
@@ -411,15 +413,22 @@ class DBAdapter(ABC):
             for obj in objects:
                 to_file.write("---\n")
                 yaml.dump(obj, to_file)
-        else:
+        elif format == "json":
+            streaming = False
+            # encode objects one at a time instead of materializing the
+            # whole collection in a list
+            to_file.write('{"metadata": ' + json.dumps(metadata) + ', "objects": [')
+            for i, obj in enumerate(objects):
+                if i:
+                    to_file.write(", ")
+                to_file.write(json.dumps(obj))
+            to_file.write("]}")
+        elif format == "yaml":
             streaming = False
             database = {"metadata": metadata, "objects": list(objects)}
-            if format == "json":
-                json.dump(database, to_file)
-            elif format == "yaml":
-                yaml.dump(database, to_file)
-            else:
-                raise ValueError(f"Unknown format {format}")
+            yaml.dump(database, to_file)
+        else:
+            raise ValueError(f"Unknown format {format}")
         if streaming:
             if not metadata_to_file:
                 raise ValueError("Streaming dump requires metadata_to_file")
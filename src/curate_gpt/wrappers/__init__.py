@@ -5,6 +5,9 @@ Wrappers allow for dynamic or static loading of an external data source
 into a store.
 """
 
+from functools import lru_cache
+from typing import Type
+
 from curate_gpt.wrappers.base_wrapper import BaseWrapper
 
 __all__ = [
@@ -39,7 +42,8 @@ def get_all_subclasses(cls):
     ]
 
 
-def get_wrapper(name: str, **kwargs) -> BaseWrapper:
+@lru_cache(maxsize=None)
+def _get_wrapper_class(name: str) -> Type[BaseWrapper]:
     # NOTE: ORDER DEPENDENT. TODO: fix this
     from curate_gpt.wrappers.bio.alliance_gene_wrapper import AllianceGeneWrapper  # noqa
     from curate_gpt.wrappers.bio.bacdive_wrapper import BacDiveWrapper  # noqa
@@ -75,5 +79,9 @@ def get_wrapper(name: str, **kwargs) -> BaseWrapper:
 
     for c in get_all_subclasses(BaseWrapper):
         if c.name == name:
-            return c(**kwargs)
+            return c
     raise ValueError(f"Unknown view {name}, not found in {get_all_subclasses(BaseWrapper)}")
+
+
+def get_wrapper(name: str, **kwargs) -> BaseWrapper:
+    return _get_wrapper_class(name)(**kwargs)
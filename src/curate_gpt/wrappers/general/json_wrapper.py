@@ -2,6 +2,7 @@
 import json
 import logging
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import ClassVar, Dict, Iterable, Iterator, Optional
 
 import yaml
@@ -12,6 +13,12 @@ from curate_gpt.wrappers.base_wrapper import BaseWrapper
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=64)
+def _compile_jsonpath(expr: str):
+    """Compile a jsonpath expression, memoized (parsing is pyparsing-slow)."""
+    return parse(expr)
+
+
 @dataclass
 class JSONWrapper(BaseWrapper):
 
@@ -44,6 +51,6 @@ class JSONWrapper(BaseWrapper):
         yield from self.wrap_object(obj)
 
     def wrap_object(self, obj: Dict) -> Iterator[Dict]:
-        jsonpath_expression = parse(self.path_expression)
+        jsonpath_expression = _compile_jsonpath(self.path_expression)
         for match in jsonpath_expression.find(obj):
             yield match.value
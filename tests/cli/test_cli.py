@@ -1,3 +1,7 @@
+from types import SimpleNamespace
+
+import curate_gpt.cli
+import yaml
 from curate_gpt.cli import main
 
 
@@ -11,3 +15,82 @@ def test_help(runner):
     result = runner.invoke(main, ["--help"])
     assert result.exit_code == 0
     assert "index" in result.output
+
+
+class FailingInsertAdapter:
+    """Stand-in adapter whose insert always fails."""
+
+    def __init__(self, path, **kwargs):
+        self.path = path
+        self.client = None
+
+    def list_collection_names(self):
+        return []
+
+    def remove_collection(self, collection, exists_ok=False, **kwargs):
+        pass
+
+    def insert(self, objs, **kwargs):
+        raise RuntimeError("insert failed")
+
+    def update_collection_metadata(self, collection, **kwargs):
+        pass
+
+
+def test_index_parallel_insert_failure(runner, monkeypatch, tmp_path):
+    """
+    A failing insert on the parallel index path must surface the error
+    instead of deadlocking producers on the bounded queue.
+
+    :param runner:
+    :param monkeypatch:
+    :param tmp_path:
+    :return:
+    """
+    files = []
+    for i in range(4):
+        f = tmp_path / f"objs{i}.yaml"
+        f.write_text(
+            yaml.dump_all([{"id": f"X:{i}-{j}", "label": f"obj {i}-{j}"} for j in range(20)])
+        )
+        files.append(str(f))
+    monkeypatch.setattr(curate_gpt.cli, "ChromaDBAdapter", FailingInsertAdapter)
+    result = runner.invoke(
+        main,
+        ["index", "-p", str(tmp_path / "db"), "-c", "test", "-j", "2", "--batch-size", "5", *files],
+    )
+    assert result.exit_code != 0
+    assert isinstance(result.exception, RuntimeError)
+
+
+def test_extract_from_pubmed_write_failure(runner, monkeypatch, tmp_path):
+    """
+    A failing writer thread must surface its error instead of deadlocking
+    the extraction loop on the bounded write queue.
+
+    :param runner:
+    :param monkeypatch:
+    :param tmp_path:
+    :return:
+    """
+    from curate_gpt.agents import dase_agent
+    from curate_gpt.wrappers.literature import pubmed_wrapper
+
+    monkeypatch.setattr(curate_gpt.cli, "ChromaDBAdapter", FailingInsertAdapter)
+    monkeypatch.setattr(
+        pubmed_wrapper.PubmedWrapper, "fetch_full_text", lambda self, pmid: "full text"
+    )
+    monkeypatch.setattr(
+        dase_agent.DatabaseAugmentedStructuredExtraction,
+        "extract",
+        lambda self, text, **kwargs: SimpleNamespace(object={"ok": True}),
+    )
+    # the embedded slash makes every output filename invalid, so the first
+    # write fails; enough ids to overflow the bounded queue if undrained
+    ids = [f"PMID:bad/{i}" for i in range(40)]
+    result = runner.invoke(
+        main,
+        ["extract-from-pubmed", "-p", str(tmp_path / "db"), "-o", str(tmp_path / "out"), *ids],
+    )
+    assert result.exit_code != 0
+    assert isinstance(result.exception, OSError)